@@ -13,6 +13,8 @@ class Adapter(ABC):
     an integer of a fixed maximum bitlength, and back again.
     """
 
+    __slots__ = ('bitlength', 'p')
+
     def __init__(self, bitlength):
         # TODO rewrite to work better with bitlength and prime specification
         # TODO how do we separate shamir secret sharing, which works over any
@@ -29,10 +31,24 @@ class Adapter(ABC):
     def to_int(self, str_value):
         pass
 
+    def to_int_batch(self, str_values):
+        """
+        Convert a sequence of strings to integers.  Subclasses may override
+        this to convert many values more efficiently than one at a time.
+        """
+        return [self.to_int(v) for v in str_values]
+
     @abstractmethod
     def from_int(self, int_value, pretty=False):
         pass
 
+    def from_int_batch(self, int_values, pretty=False):
+        """
+        Convert a sequence of integers to strings.  Subclasses may override
+        this to convert many values more efficiently than one at a time.
+        """
+        return [self.from_int(v, pretty=pretty) for v in int_values]
+
     @staticmethod
     @abstractmethod
     def get_bitlength(str_value):
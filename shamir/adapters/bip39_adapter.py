@@ -2,60 +2,196 @@ from mnemonic import Mnemonic
 from shamir.adapters import Adapter
 from shamir.mod_util import canonical_repr
 
+from functools import lru_cache
+from hashlib import sha256
 from itertools import zip_longest
 from math import ceil
 
+import pkgutil
+import unicodedata
+
+
+@lru_cache(maxsize=8)
+def _get_mnemonic(language):
+    """
+    Return a shared Mnemonic object for the given language, so that the
+    wordlist is read from disk at most once per process.
+    """
+    return Mnemonic(language)
+
+
+_WORDLISTS = {}
+_WORD_INDICES = {}
+
+
+def _load_wordlist(language):
+    """
+    Return the BIP39 wordlist for the given language as a tuple, read from
+    the data files of the ``mnemonic`` package once per process.
+    """
+    if language not in _WORDLISTS:
+        try:
+            data = pkgutil.get_data('mnemonic', f'wordlist/{language}.txt')
+        except OSError:
+            data = None
+        if data is None:
+            raise ValueError("unsupported BIP39 language (%s)" % language)
+        _WORDLISTS[language] = tuple(data.decode('utf-8').split())
+    return _WORDLISTS[language]
+
+
+def _load_word_index(language):
+    """
+    Return a dict mapping each word of a BIP39 wordlist to its index.  Words
+    are indexed under both their composed and decomposed Unicode forms, as
+    wordlists and user input may use either.
+    """
+    if language not in _WORD_INDICES:
+        word2idx = dict()
+        for i, w in enumerate(_load_wordlist(language)):
+            word2idx[w] = i
+            word2idx[unicodedata.normalize('NFC', w)] = i
+            word2idx[unicodedata.normalize('NFKD', w)] = i
+        _WORD_INDICES[language] = word2idx
+    return _WORD_INDICES[language]
+
 
 class BIP39Adapter(Adapter):
+    # number of words in a mnemonic phrase -> bitlength of its entropy
+    WORDS_TO_BITS = {12: 128, 15: 160, 18: 192, 21: 224, 24: 256}
+
+    __slots__ = ('language', '_delimiter', '_word2idx', '_wordlist_tuple',
+                 '_entropy_bytes', '_cs_bits', '_ms')
+
     def __init__(self, bitlength, language="english"):
         if bitlength not in [128, 160, 192, 224, 256]:
             raise ValueError(
                 "invalid bitlength for BIP39 mnemonics (%d)" % bitlength)
         super(BIP39Adapter, self).__init__(bitlength)
-        self.bip39 = Mnemonic(language)
+        self.language = language
+        self._wordlist_tuple = _load_wordlist(language)
+        self._word2idx = _load_word_index(language)
+        # BIP39 specifies that Japanese mnemonics are joined by an
+        # ideographic space
+        self._delimiter = '\u3000' if language == 'japanese' else ' '
+        self._entropy_bytes = bitlength // 8
+        self._cs_bits = bitlength // 32
+        self._ms = (bitlength + self._cs_bits) // 11
 
     def to_int(self, str_value):
-        mnemo = self.bip39.expand(str_value)
-        if not self.bip39.check(mnemo):
+        return self._to_entropy_fast(self._split_words(str_value))
+
+    def to_int_batch(self, str_values):
+        split_words, to_entropy = self._split_words, self._to_entropy_fast
+        return [to_entropy(split_words(v)) for v in str_values]
+
+    def _split_words(self, str_value):
+        """
+        Split a mnemonic seed phrase into words, expanding abbreviations, and
+        check that the number of words matches the adapter bitlength.
+        """
+        words = str.split(str_value)
+        word2idx = self._word2idx
+        if not all(w in word2idx for w in words):
+            # fall back to the library to expand abbreviated words
+            words = str.split(self.bip39.expand(str_value))
+        if len(words) != self._ms:
+            if len(words) in BIP39Adapter.WORDS_TO_BITS:
+                raise ValueError(
+                    "mnemonic has incorrect bitlength (%d)"
+                    % BIP39Adapter.WORDS_TO_BITS[len(words)])
             raise ValueError("invalid BIP39 mnemonic")
-        bitlength = 32 * (len(str.split(mnemo)) // 3)
-        if bitlength != self.bitlength:
-            raise ValueError(
-                "mnemonic has incorrect bitlength (%d)" % bitlength)
-        return int.from_bytes(self.bip39.to_entropy(mnemo), byteorder='big')
+        return words
+
+    @property
+    def bip39(self):
+        """
+        Mnemonic object for the adapter language, used for operations not
+        implemented directly by the adapter.
+        """
+        return _get_mnemonic(self.language)
+
+    def _to_entropy_fast(self, words):
+        """
+        Decode the words of a mnemonic seed phrase to its integer entropy
+        value, verifying the BIP39 checksum.  Words are looked up in a
+        precomputed index rather than by linear search through the wordlist.
+        Assumes that the number of words matches the adapter bitlength.
+        """
+        word2idx = self._word2idx
+        acc = 0
+        try:
+            for w in words:
+                acc = (acc << 11) | word2idx[w]
+        except KeyError:
+            raise ValueError("invalid BIP39 mnemonic")
+
+        cs_bits = self._cs_bits
+        checksum = acc & ((1 << cs_bits) - 1)
+        entropy_int = acc >> cs_bits
+        entropy_bytes = entropy_int.to_bytes(
+            self._entropy_bytes, byteorder='big')
+        if BIP39Adapter._checksum(entropy_bytes, cs_bits) != checksum:
+            raise ValueError("invalid BIP39 mnemonic")
+        return entropy_int
+
+    @staticmethod
+    def _checksum(entropy_bytes, cs_bits):
+        """
+        Return the BIP39 checksum of the given entropy, i.e. the leading
+        ``cs_bits`` bits of its SHA-256 digest.
+        """
+        return sha256(entropy_bytes).digest()[0] >> (8 - cs_bits)
 
     def from_int(self, int_value, pretty=False):
         if not canonical_repr(int_value, self.p):
             raise ValueError(
                 "integer value not properly represented by bitlength")
-        mnemonic = self.bip39.to_mnemonic(
-            int_value.to_bytes(self.bitlength // 8, byteorder='big')
-        )
+        cs, ms = self._cs_bits, self._ms
+        checksum = BIP39Adapter._checksum(
+            int_value.to_bytes(self._entropy_bytes, byteorder='big'), cs)
+        n = (int_value << cs) | checksum
+        wordlist = self._wordlist_tuple
+        words = [
+            wordlist[(n >> (11 * (ms - 1 - i))) & 0x7FF] for i in range(ms)
+        ]
         if not pretty:
-            return mnemonic
+            return self._delimiter.join(words)
         else:
-            return BIP39Adapter.format_mnemonic(mnemonic)
+            return BIP39Adapter.format_mnemonic(words)
 
     @staticmethod
     def get_bitlength(str_value):
         """
         Return the bitlength associated to a mnemonic seed phrase.
         """
-        return 32 * (len(str.split(str_value)) // 3)
+        num_words = len(str.split(str_value))
+        bitlength = BIP39Adapter.WORDS_TO_BITS.get(num_words)
+        if bitlength is None:
+            bitlength = 32 * (num_words // 3)
+        return bitlength
 
     @staticmethod
     def format_mnemonic(str_value, pad_width=10, n_columns=2, numbers=True):
-        words = str.split(str_value)
-        c_len = ceil(len(words) / n_columns)
+        """
+        Format a mnemonic seed phrase as numbered columns of words.  The phrase
+        may be given either as a string or as a list of words.
+        """
+        if isinstance(str_value, str):
+            words = str.split(str_value)
+        else:
+            words = list(str_value)
+        num_words = len(words)
+        c_len = ceil(num_words / n_columns)
+        col_starts = range(0, num_words, c_len)
+        col_ends = [min(start + c_len, num_words) for start in col_starts]
         columns = list()
-        for start_idx in range(0, len(words), c_len):
+        for start, end in zip(col_starts, col_ends):
             # parameters
-            number_max_size = len(str(min(start_idx + c_len, len(words))))
-            format_st = "%%%dd. " % number_max_size
+            format_str = f"{{n:>{len(str(end))}d}}. {{w:<{pad_width}}}"
             # generate and format column
-            col = words[start_idx:start_idx + c_len]
-            col = [format_st % (start_idx + j + 1) + w.ljust(pad_width)
-                   for j, w in enumerate(col)]
+            col = [format_str.format(n=n, w=w)
+                   for n, w in enumerate(words[start:end], start + 1)]
             columns.append(col)
         rows = zip_longest(*columns, fillvalue='')
         return '\n'.join([''.join(row) for row in rows])
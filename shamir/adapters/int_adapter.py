@@ -1,30 +1,28 @@
 from shamir.adapters import Adapter
-from shamir.mod_util import canonical_repr
 
 
 class IntAdapter(Adapter):
+    __slots__ = ()
+
     def __init__(self, bitlength):
         super(IntAdapter, self).__init__(bitlength)
 
     def to_int(self, value):
-        self._validate(int(value))
-        return int(value)
+        v = int(value)
+        if not (0 <= v < self.p):
+            raise ValueError("integer value (%d) not properly"
+                             " represented by bitlength" % v)
+        return v
 
     def from_int(self, value, pretty=False):
-        self._validate(value)
-        if not pretty:
-            return str(value)
-        else:
-            return str(value)
-
-    def _validate(self, value):
-        if not canonical_repr(value, self.p):
-            raise ValueError("integer value (%d) not properly"
+        if type(value) is not int or not (0 <= value < self.p):
+            raise ValueError("integer value (%s) not properly"
                              " represented by bitlength" % value)
+        return str(value)
 
-    @classmethod
+    @staticmethod
     def get_bitlength(value):
         """
-        Return the bitlength associated to a mnemonic seed phrase.
+        Return the bitlength associated to an integer value.
         """
-        return int.bit_length(value)
+        return int(value).bit_length()
@@ -2,7 +2,6 @@ from shamir import Shamir, get_prime, format_prime, version
 from shamir.shamir import ShamirSpec
 from shamir.share import ShareFactory, Share
 from shamir.adapters import BIP39Adapter
-from mnemonic import Mnemonic
 
 import click
 import logging
@@ -92,8 +91,8 @@ def generate(threshold, num_shares, secret, lang,
             print(f"Share {prefix_str}")
             print(adapter.from_int(share.value, pretty=True))
     else:
-        for share in shares:
-            print(sh_fact.format(share, adapter))
+        for share_str in sh_fact.format_batch(shares, adapter):
+            print(share_str)
 
 
 @cli.command()
@@ -118,7 +117,7 @@ def extend(new_share_number, share_strs, lang, pretty, list_params):
     the BIP-39 mnemonic phrase of the share.
     """
     if not os.isatty(sys.stdin.fileno()):
-        share_strs += tuple(line.rstrip() for line in sys.stdin.readlines())
+        share_strs += tuple(line.rstrip() for line in sys.stdin)
 
     if share_strs == ():
         exit_error("no shamir pool shares specified")
@@ -131,7 +130,7 @@ def extend(new_share_number, share_strs, lang, pretty, list_params):
 
         new_share_number = tuple(int(n) for n in new_share_number.split())
 
-        shares = tuple(sh_fact.parse(sh, adapter) for sh in share_strs)
+        shares = sh_fact.parse_batch(share_strs, adapter)
 
         # test for empty prefixes
         for sh in shares:
@@ -184,7 +183,7 @@ def combine(share_strs, file, lang, pretty, list_params):
     the BIP-39 mnemonic phrase of the share.
     """
     if not os.isatty(sys.stdin.fileno()):
-        share_strs += tuple(line.rstrip() for line in sys.stdin.readlines())
+        share_strs += tuple(line.rstrip() for line in sys.stdin)
 
     if share_strs == ():
         exit_error("no shamir pool shares specified")
@@ -198,7 +197,7 @@ def combine(share_strs, file, lang, pretty, list_params):
         prime, prime_str = get_prime(bitlength), format_prime(bitlength)
         shamir = Shamir(prime)
 
-        shares = tuple(sh_fact.parse(sh, adapter) for sh in share_strs)
+        shares = sh_fact.parse_batch(share_strs, adapter)
         secret = shamir.combine(shares)
 
         if list_params:
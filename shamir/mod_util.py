@@ -1,3 +1,10 @@
+from functools import lru_cache
+
+# Polynomials with at most this many coefficients are evaluated by generated
+# functions with Horner's method unrolled into a single expression.
+UNROLL_MAX_COEFFS = 16
+
+
 def canonical_repr(num, modulus):
     """
     Return whether ``num`` is an int in the range [0, modulus).
@@ -5,6 +12,23 @@ def canonical_repr(num, modulus):
     return (type(num) is int) and (num >= 0) and (num < modulus)
 
 
+def fast_mod_pseudo_mersenne(a, n, c):
+    """
+    Reduce ``a`` modulo the prime p = 2^n - c, for small c, using shifts and
+    masks in place of bignum division.  Since 2^n = c (mod p), the high bits of
+    ``a`` may be folded down as a = lo + c * hi (mod p).
+    """
+    p = (1 << n) - c
+    if a < 0:
+        return a % p
+    mask = (1 << n) - 1
+    while a >> n:
+        a = (a & mask) + c * (a >> n)
+    while a >= p:
+        a -= p
+    return a
+
+
 def eval_poly_mod(poly_coeffs, x, modulus):
     """
     Evaluates a polynomial at a point x, modulo an integer.  The polynomial is
@@ -12,12 +36,86 @@ def eval_poly_mod(poly_coeffs, x, modulus):
     exponent.  If a_i is the i-th element of ``poly_coeffs``, then the
     associated polynomial is: a_0 x^0 + a_1 x^1 + ... + a_k x^k
     """
+    # Reduction is deferred until the accumulator grows beyond twice the size
+    # of the modulus; for small x this skips most bignum divisions.
+    x %= modulus
+    limit = 2 * modulus.bit_length()
     accum = 0
     for coeff in reversed(poly_coeffs):
-        accum *= x
-        accum += coeff
-        accum %= modulus
-    return accum
+        accum = accum * x + coeff
+        if accum.bit_length() > limit:
+            accum %= modulus
+    return accum % modulus
+
+
+@lru_cache(maxsize=64)
+def unrolled_poly_mod(num_coeffs, modulus):
+    """
+    Return a function ``poly(x, c_0, ..., c_{n-1})`` evaluating the polynomial
+    with n = ``num_coeffs`` coefficients at x, modulo an integer.  The function
+    is generated with Horner's method unrolled into a single expression and
+    the modulus embedded as a constant, and reduces only once at the end.
+    """
+    if type(num_coeffs) is not int or num_coeffs < 1:
+        raise ValueError("invalid number of coefficients (%s)" % num_coeffs)
+    if type(modulus) is not int:
+        raise ValueError("modulus must be an int")
+
+    expr = "c%d" % (num_coeffs - 1)
+    for i in range(num_coeffs - 2, -1, -1):
+        expr = "(%s) * x + c%d" % (expr, i)
+    expr = "(%s) %% %d" % (expr, modulus)
+    args = ", ".join("c%d" % i for i in range(num_coeffs))
+    source = "def poly(x, %s):\n    return %s\n" % (args, expr)
+
+    namespace = dict()
+    exec(source, namespace)
+    return namespace["poly"]
+
+
+def eval_poly_mod_batch(poly_coeffs, xs, modulus):
+    """
+    Evaluates a polynomial at each of the points in ``xs``, modulo an integer,
+    returning a list of values.  Equivalent to calling ``eval_poly_mod`` for
+    each point, but runs Horner's method over all points at once, so that the
+    decision of when to reduce is made once per coefficient.
+    """
+    if 0 < len(poly_coeffs) <= UNROLL_MAX_COEFFS:
+        poly = unrolled_poly_mod(len(poly_coeffs), modulus)
+        return [poly(x % modulus, *poly_coeffs) for x in xs]
+
+    xs = [x % modulus for x in xs]
+    x_bits = max((x.bit_length() for x in xs), default=0)
+    p_bits = modulus.bit_length()
+    limit = 2 * p_bits
+    accums = [0] * len(xs)
+    bits = 0  # upper bound on the bit length of all accumulators
+    for coeff in reversed(poly_coeffs):
+        accums = [a * x + coeff for a, x in zip(accums, xs)]
+        bits = max(bits + x_bits, coeff.bit_length()) + 1
+        if bits > limit:
+            accums = [a % modulus for a in accums]
+            bits = p_bits
+    return [a % modulus for a in accums]
+
+
+def batch_inverse_mod(values, modulus):
+    """
+    Return a list of the inverses of the given values modulo an integer, using
+    Montgomery's trick to compute all of them with a single modular inversion.
+    Raises ValueError if any value is not invertible.
+    """
+    # prefix products: prefix[i] = values[0] * ... * values[i-1]
+    prefix = [1]
+    for v in values:
+        prefix.append(prefix[-1] * v % modulus)
+    inv = pow(prefix[-1], -1, modulus)
+
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inv * prefix[i] % modulus
+        inv = inv * values[i] % modulus
+    return inverses
 
 
 def lagrange_interpolate(x, x_s, y_s, modulus):
@@ -25,19 +123,70 @@ def lagrange_interpolate(x, x_s, y_s, modulus):
     Find the y-value for the given x, given n (x, y) points;
     k points will define a polynomial of up to kth order.
     """
+    # inverted denominators of the Lagrange basis polynomials depend only on
+    # the points, and are cached across calls
+    x_s = tuple(x_s)
+    weights = barycentric_weights(x_s, modulus)
+    c_s = [y * w for y, w in zip(y_s, weights)]
+    return lagrange_eval(x, x_s, c_s, modulus)
+
+
+def lagrange_eval(x, x_s, c_s, modulus):
+    """
+    Evaluate sum_i c_i * prod_{j != i} (x - x_j) at the given x, modulo an
+    integer.  With c_i = y_i * w_i for barycentric weights w_i, this is the
+    value at x of the polynomial through the points (x_i, y_i).
+    """
+    k = len(x_s)
+
+    # numerator of each Lagrange basis polynomial at x, that is
+    # prod_{j != i} (x - x_j), from prefix and suffix products of the factors
+    diffs = [x - xj for xj in x_s]
+    suffix = [1] * (k + 1)
+    for i in range(k - 1, -1, -1):
+        suffix[i] = suffix[i + 1] * diffs[i] % modulus
+
+    accum, prefix = 0, 1
+    for i in range(k):
+        accum += c_s[i] * (prefix * suffix[i + 1] % modulus)
+        prefix = prefix * diffs[i] % modulus
+    return accum % modulus
+
+
+@lru_cache(maxsize=256)
+def barycentric_weights(x_s, modulus):
+    """
+    Return the barycentric weights w_i = 1 / prod_{j != i} (x_i - x_j) of the
+    given tuple of distinct points, modulo an integer.  Results are cached, so
+    that repeated interpolations over the same points share this work.
+    """
     k = len(x_s)
     if k != len(set(x_s)):
         raise ValueError("points must be distinct")
 
-    accum = 0
+    dens = list()
+    for i in range(k):
+        den = 1
+        for j in range(k):
+            if j != i:
+                den *= x_s[i] - x_s[j]
+        dens.append(den % modulus)
+    return tuple(batch_inverse_mod(dens, modulus))
+
+
+def lagrange_at_zero(x_s, y_s, weights, modulus):
+    """
+    Find the y-value at x = 0 of the polynomial through the given points,
+    using barycentric weights as computed by ``barycentric_weights``.
+    """
+    # L_i(0) = w_i * prod_{j != i} (-x_j), from prefix and suffix products
+    k = len(x_s)
+    suffix = [1] * (k + 1)
+    for i in range(k - 1, -1, -1):
+        suffix[i] = suffix[i + 1] * -x_s[i]
+
+    accum, prefix = 0, 1
     for i in range(k):
-        others = list(x_s)
-        cur = others.pop(i)
-        term = y_s[i]
-        for o in others:
-            term *= x - o
-            term *= pow(cur - o, -1, modulus)
-            term %= modulus
-        accum += term
-    accum %= modulus
-    return accum
+        accum += y_s[i] * weights[i] * prefix * suffix[i + 1]
+        prefix *= -x_s[i]
+    return accum % modulus
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 prime_offsets_filename = 'shamir/data/prime-offsets.dat'
 
 # Description of largest primes smaller than some powers of 2.
@@ -7,7 +9,7 @@ prime_offsets_filename = 'shamir/data/prime-offsets.dat'
 
 # Corresponding primes given by: p = 2**idx - value
 with open(prime_offsets_filename, 'r') as f:
-    prime_offsets = [None] + [int(n) for n in f]
+    prime_offsets = [None, *map(int, f.read().split())]
 
 
 def _check_bitlength(bitlength):
@@ -26,7 +28,7 @@ def get_prime(bitlength):
     given bitlength.
     """
     _check_bitlength(bitlength)
-    return 2**bitlength - prime_offsets[bitlength]
+    return _get_prime(bitlength)
 
 
 def format_prime(bitlength):
@@ -35,4 +37,16 @@ def format_prime(bitlength):
     bitlength.
     """
     _check_bitlength(bitlength)
+    return _format_prime(bitlength)
+
+
+# Results are cached per bitlength, behind the checks above, so that only
+# valid int bitlengths reach the caches.
+@lru_cache(maxsize=None)
+def _get_prime(bitlength):
+    return 2**bitlength - prime_offsets[bitlength]
+
+
+@lru_cache(maxsize=None)
+def _format_prime(bitlength):
     return "2^%d - %d" % (bitlength, prime_offsets[bitlength])
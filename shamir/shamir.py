@@ -15,11 +15,16 @@ This adaptation is licensed according to the file `LICENSE` in the base
 directory of the repository.
 """
 
-from shamir.mod_util import eval_poly_mod, lagrange_interpolate
+from shamir.mod_util import (
+    eval_poly_mod, eval_poly_mod_batch, lagrange_eval, barycentric_weights,
+    lagrange_at_zero)
 from shamir.share import Share, ShareFactory
+from collections import defaultdict
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Tuple, Union
 
+import os
 import secrets
 import random
 
@@ -36,7 +41,8 @@ class Shamir:
         """
         self.p = prime
 
-    def generate(self, secret, spec, rand_indices=None, seed=None):
+    def generate(self, secret, spec, rand_indices=None, seed=None,
+                 validate=True):
         """
         Generates random shamir secret shares for a given secret, and specified
         number of bits.  Returns the points of the shares.
@@ -49,11 +55,16 @@ class Shamir:
 
         If `coeffs` is unspecified, then random coefficients are generated
         using the `secrets` standard library module.
+
+        If `validate` is false, the secret and the specification are assumed
+        to be valid and are not checked, for callers generating many pools
+        from one specification they have already validated.
         """
-        if type(secret) is not Share:
-            raise ValueError("secret must be of type Share")
+        if validate:
+            if type(secret) is not Share:
+                raise ValueError("secret must be of type Share")
 
-        spec.validate()
+            spec.validate()
 
         if seed is None:
             r = secrets.SystemRandom()
@@ -77,7 +88,7 @@ class Shamir:
 
     def _rec_generate(self, secret, spec, rand_indices, rng):
         # 1. generate coefficients
-        num_shares = spec.num_shares()
+        num_shares = spec.num_shares
         threshold = spec.threshold
 
         if num_shares >= self.p:
@@ -86,8 +97,7 @@ class Shamir:
 
         coeff_rng = rng(0)
         coeffs = [secret.value % self.p]
-        coeffs.extend(
-            [coeff_rng.randrange(self.p) for _ in range(threshold - 1)])
+        coeffs.extend(_sample_coeffs(threshold - 1, self.p, coeff_rng))
 
         # 2. generate indices
         if rand_indices is None:
@@ -98,34 +108,30 @@ class Shamir:
                 range(1, rand_indices + 1), k=num_shares)
 
         # 3. generate shares
-        share_pts = [
-            (x, eval_poly_mod(coeffs, x, self.p)) for x in indices
-        ]
+        share_pts = list(
+            zip(indices, eval_poly_mod_batch(coeffs, indices, self.p)))
 
         # 4. recursive generate on sub_specs
+        prefix = secret.prefix
         shares = list()
         if type(spec.shares) is int:
-            shares.extend([
-                Share(y, secret.prefix + (x, )) for x, y in share_pts
-            ])
+            for x, y in share_pts:
+                shares.append(Share(y, prefix + (x, )))
         else:
+            idx = 0
             for sh in spec.shares:
-                idx = 0
                 if type(sh) is int:
-                    shares.extend([
-                        Share(y, secret.prefix + (x, ))
-                        for x, y in share_pts[idx:idx + sh]
-                    ])
+                    for x, y in share_pts[idx:idx + sh]:
+                        shares.append(Share(y, prefix + (x, )))
+                    idx += sh
                 else:
-                    sub_shares = [
-                        Share(y, secret.prefix + (x, ))
-                        for x, y in share_pts[idx:idx + sh[0]]
-                    ]
-                    for s_sh in sub_shares:
+                    for x, y in share_pts[idx:idx + sh[0]]:
                         shares.extend(
                             self._rec_generate(
-                                s_sh, sh[1], rand_indices, rng)
+                                Share(y, prefix + (x, )), sh[1],
+                                rand_indices, rng)
                         )
+                    idx += sh[0]
 
         # 5. return list of all generated shares
         return shares
@@ -150,32 +156,21 @@ class Shamir:
         if x % self.p == 0 or any(n % self.p == 0 for n in prefix):
             raise ValueError("x-value of 0 is reserved")
 
-        if len(shares) == 0:
-            raise ValueError("must specify at least one share")
+        return self.build_extensible(shares, prefix).extend(x)
 
-        active_shares = dict()
-        for sh in shares:
-            p = sh.prefix
-            if len(p) > len(prefix) and p[:len(prefix)] == prefix:
-                head = p[:len(prefix) + 1]
-                if head not in active_shares:
-                    active_shares[head] = list()
-                active_shares[head].append(sh)
-
-        peers = list()
-        for p in active_shares:
-            peers.append(self._combine(active_shares[p]))
-        if len(peers) == 0:
-            raise ValueError("specified prefix has no peers")
+    def build_extensible(self, shares, prefix=()):
+        """
+        Prepare the secret share pool for extension by any number of shares
+        with the given prefix.  Returns an ExtensiblePool object.
+        """
+        if type(prefix) is not tuple or \
+                any(type(n) is not int for n in prefix):
+            raise ValueError("prefix must be a tuple of ints")
 
-        new_value = lagrange_interpolate(
-            x,
-            tuple(sh.x() for sh in peers),
-            tuple(sh.value for sh in peers),
-            self.p
-        )
+        if any(n % self.p == 0 for n in prefix):
+            raise ValueError("x-value of 0 is reserved")
 
-        return Share(new_value, prefix + (x, ))
+        return ExtensiblePool(self, shares, prefix)
 
     def combine(self, shares):
         """
@@ -196,34 +191,26 @@ class Shamir:
             if sh.prefix == common_prefix:
                 return sh
         len_common_prefix = len(common_prefix)
-        result = None
+        max_depth = max(len(sh.prefix) for sh in shares)
 
-        # generate all prefixes and subprefixes
-        share_pool = dict()
+        # buckets[d] maps each prefix of length d to the shares directly
+        # beneath it in the pool
+        buckets = [defaultdict(list) for _ in range(max_depth)]
         for sh in shares:
-            for i in range(len_common_prefix, len(sh.prefix)):
-                pr = sh.prefix[:i]
-                if pr not in share_pool:
-                    share_pool[pr] = list()
-            share_pool[sh.prefix[:-1]].append(sh)
-
-        # merge shares given with each common prefix
-        all_prefixes = list(share_pool.keys())
-        all_prefixes.sort(key=(lambda pr: len(pr)), reverse=True)
-        for pr in all_prefixes:
-            xs = tuple(sh.x() for sh in share_pool[pr])
-            ys = tuple(sh.value for sh in share_pool[pr])
-            merged_val = lagrange_interpolate(0, xs, ys, self.p)
-            merged = Share(merged_val, pr)
-
-            if pr == common_prefix:
-                result = merged
-                break
-            else:
-                new_pr = pr[:-1]
-                share_pool[new_pr].append(merged)
-
-        return result
+            buckets[len(sh.prefix) - 1][sh.prefix[:-1]].append(sh)
+
+        # merge shares given with each common prefix, deepest first, passing
+        # merged shares up to the bucket of their parent prefix
+        for depth in range(max_depth - 1, len_common_prefix - 1, -1):
+            for pr, group in buckets[depth].items():
+                xs = tuple(sh.x() for sh in group)
+                ys = tuple(sh.value for sh in group)
+                weights = barycentric_weights(xs, self.p)
+                merged = Share(lagrange_at_zero(xs, ys, weights, self.p), pr)
+
+                if depth == len_common_prefix:
+                    return merged
+                buckets[depth - 1][pr[:-1]].append(merged)
 
     def gen(self, secret, coeffs, indices):
         # coeffs for random polynomial in (ZZ/pZZ)[x] of degree threshold-1
@@ -239,7 +226,90 @@ class Shamir:
     # for extend CLI, extend at level of common prefix
 
 
-@dataclass
+class ExtensiblePool:
+    """
+    Shares of a Shamir secret pool prepared for extension by new shares with
+    a fixed prefix.  The peers of the new shares are combined from the given
+    shares and weighted once, so that each new share then takes a number of
+    operations linear in the number of peers.
+    """
+
+    def __init__(self, shamir, shares, prefix=()):
+        if len(shares) == 0:
+            raise ValueError("must specify at least one share")
+
+        active_shares = defaultdict(list)
+        for sh in shares:
+            p = sh.prefix
+            if len(p) > len(prefix) and p[:len(prefix)] == prefix:
+                active_shares[p[:len(prefix) + 1]].append(sh)
+
+        peers = list()
+        for p in active_shares:
+            peers.append(shamir._combine(active_shares[p]))
+        if len(peers) == 0:
+            raise ValueError("specified prefix has no peers")
+
+        self.p = shamir.p
+        self.prefix = prefix
+        self._xs = tuple(sh.x() for sh in peers)
+        weights = barycentric_weights(self._xs, self.p)
+        self._cs = [sh.value * w for sh, w in zip(peers, weights)]
+
+    def extend(self, x):
+        """
+        Generate the share of the pool with the given x-value.
+        """
+        if type(x) is not int:
+            raise ValueError("extending value must be an int")
+
+        if x % self.p == 0:
+            raise ValueError("x-value of 0 is reserved")
+
+        return Share(lagrange_eval(x, self._xs, self._cs, self.p),
+                     self.prefix + (x, ))
+
+
+def _sample_coeffs(count, p, rng):
+    """
+    Sample ``count`` integers uniformly from [0, p) using the given random
+    number generator.  For the system random number generator, randomness for
+    all values is read from the OS in one call and rejection sampled, instead
+    of making one OS call per value.
+    """
+    n_bits = p.bit_length()
+    if not isinstance(rng, random.SystemRandom):
+        return [_sample_below(p, n_bits, rng) for _ in range(count)]
+
+    n_bytes = (n_bits + 7) // 8
+    mask = (1 << n_bits) - 1
+    coeffs = list()
+    while len(coeffs) < count:
+        # oversample, as candidates of n_bits bits are rejected if >= p
+        buf = os.urandom(2 * (count - len(coeffs)) * n_bytes)
+        for i in range(0, len(buf), n_bytes):
+            v = int.from_bytes(buf[i:i + n_bytes], byteorder='big') & mask
+            if v < p:
+                coeffs.append(v)
+                if len(coeffs) == count:
+                    break
+    return coeffs
+
+
+def _sample_below(p, n_bits, rng):
+    """
+    Sample an integer uniformly from [0, p), where p has bit length
+    ``n_bits``, by rejection sampling ``n_bits`` random bits at a time.  For
+    the primes used here, of the form 2^n - c with small c, nearly every draw
+    is accepted.
+    """
+    while True:
+        v = rng.getrandbits(n_bits)
+        if v < p:
+            return v
+
+
+@dataclass(frozen=True)
 class ShamirSpec:
     """
     Data class representing a nested Shamir secret pool specification.  Each
@@ -253,6 +323,9 @@ class ShamirSpec:
         - A tuple consisting of an int and a ShamirSpec object, where the
           ShamirSpec specifies a subspecification to split a share into, and
           the int represents the number of shares to split in this way.
+
+    Objects are immutable, and the derived counts ``num_shares``,
+    ``total_shares`` and ``num_coeffs`` are computed once and cached.
     """
     threshold: int
     shares: Union[
@@ -263,6 +336,7 @@ class ShamirSpec:
         ]
     ]
 
+    @cached_property
     def num_shares(self):
         """
         Returns the number of shares specified by this ShamirSpec object at its
@@ -277,7 +351,9 @@ class ShamirSpec:
                     accum += sh
                 else:
                     accum += sh[0]
+            return accum
 
+    @cached_property
     def total_shares(self):
         """
         Returns the total number of shares specified by this ShamirSpec object.
@@ -290,9 +366,10 @@ class ShamirSpec:
                 if type(sh) is int:
                     accum += sh
                 else:
-                    accum += sh[0] * sh[1].total_shares()
+                    accum += sh[0] * sh[1].total_shares
             return accum
 
+    @cached_property
     def num_coeffs(self):
         """
         Returns the number of coefficients needed to specify the Shamir
@@ -306,7 +383,7 @@ class ShamirSpec:
                 if type(sh) is int:
                     pass
                 else:
-                    accum += sh[0] * sh[1].num_coeffs()
+                    accum += sh[0] * sh[1].num_coeffs
         return accum
 
     def validate(self):
@@ -334,7 +411,7 @@ class ShamirSpec:
                             "nonpositive sub-specification multiplicity")
 
         # check that top level number of shares is not smaller than threshold
-        if self.num_shares() < self.threshold:
+        if self.num_shares < self.threshold:
             raise ValueError("secret not recoverable from specified shares")
 
         # validate all sub-specifications
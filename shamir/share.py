@@ -1,6 +1,7 @@
 # class to represent (nested) Shamir shares
 
 from dataclasses import dataclass
+from itertools import takewhile
 from typing import Tuple
 import re
 
@@ -19,9 +20,16 @@ class ShareFactory:
       string) to form the prefix for the resulting share
     - All data following, which must include at least one non-whitespace
       character, is parsed by the adapter
+
+    The whole share string must match, so that content on further lines is
+    rejected rather than silently ignored.
     """
     PARSE_REGEX = '(?:([\\s,0-9]*){})?(.*\\S.*)'
 
+    # compiled parsing patterns, shared between factories with the same
+    # separator regular expression
+    _PATTERNS = dict()
+
     def __init__(self, separator=('\\s', None)):
         # self.adapter = adapter
         if type(separator) is str:
@@ -31,78 +39,140 @@ class ShareFactory:
             self.separator_re, self.separator = separator
         else:
             raise ValueError("invalid separator string specified")
-        self.re = re.compile(
-            ShareFactory.PARSE_REGEX.format(self.separator_re)
-        )
+        self.re = ShareFactory._pattern(self.separator_re)
+
+    def _split(self, share_str):
+        """
+        Split a share string into its prefix string, or None if there is no
+        prefix, and its value string.
+        """
+        groups = self._groups(share_str)
+        if groups is None:
+            raise ValueError("unable to parse share string")
+        return groups
+
+    def _groups(self, share_str):
+        # Trailing whitespace is stripped first, as otherwise the overlapping
+        # whitespace classes of the prefix and value groups make matching
+        # quadratic in the length of a trailing whitespace run.  A full match
+        # is then checked from the end of the match rather than with
+        # fullmatch, which retries every split of a long digit and whitespace
+        # prefix before rejecting.
+        s = share_str.rstrip()
+        m = self.re.match(s)
+        if m is None or m.end() != len(s):
+            return None
+        return m.groups()
+
+    @staticmethod
+    def _pattern(separator_re):
+        pattern = ShareFactory._PATTERNS.get(separator_re)
+        if pattern is None:
+            pattern = re.compile(ShareFactory.PARSE_REGEX.format(separator_re))
+            ShareFactory._PATTERNS[separator_re] = pattern
+        return pattern
 
     def parse(self, share_str, adapter):
         # chop off integers until encountering something that is not an integer
         # set a string which represents the divider in case of ambiguity
         # regular expression might make sense to do this parsing
-        m = self.re.match(share_str)
-        if m is None:
-            raise ValueError("unable to parse share string")
-        prefix, value = m.groups()
+        return ShareFactory._to_share(*self._split(share_str), adapter)
+
+    def try_parse(self, share_str, adapter):
+        """
+        Parse a share string as ``parse`` does, but return None rather than
+        raising ValueError if it is not a valid share.  Strings which do not
+        match the share format are rejected without raising an exception.
+        """
+        groups = self._groups(share_str)
+        if groups is None:
+            return None
+        try:
+            return ShareFactory._to_share(*groups, adapter)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _to_share(prefix, value, adapter):
+        prefix = ShareFactory._to_prefix(prefix)
+        return Share(adapter.to_int(value), prefix)
+
+    @staticmethod
+    def _to_prefix(prefix):
+        """
+        Convert a prefix string, or None if there is no prefix, to a tuple of
+        ints.
+        """
         if prefix is None:
-            prefix = ()
-        else:
-            prefix = tuple(int(s) for s in str(prefix).split())
-        value = adapter.to_int(value)
-        return Share(value, prefix)
+            return ()
+        return tuple(int(s) for s in str(prefix).split())
+
+    def parse_batch(self, share_strs, adapter):
+        """
+        Parse a sequence of share strings, converting all share values with a
+        single call to the adapter.  Returns a tuple of shares.
+        """
+        prefixes, values = list(), list()
+        for share_str in share_strs:
+            prefix, value = self._split(share_str)
+            prefixes.append(ShareFactory._to_prefix(prefix))
+            values.append(value)
+        values = adapter.to_int_batch(values)
+        return tuple(Share(v, p) for v, p in zip(values, prefixes))
 
     def format(self, share, adapter):
-        parts = tuple(str(n) for n in share.prefix)
+        return self._join(share.prefix, adapter.from_int(share.value))
+
+    def format_batch(self, shares, adapter):
+        """
+        Format a sequence of shares, converting all share values with a single
+        call to the adapter.  Returns a list of strings.
+        """
+        vals = adapter.from_int_batch([sh.value for sh in shares])
+        return [self._join(sh.prefix, val) for sh, val in zip(shares, vals)]
+
+    def _join(self, prefix, val):
+        parts = list(map(str, prefix))
         if self.separator is not None:
-            parts += (self.separator, )
-        val = adapter.from_int(share.value)
-        parts += (val, )
+            parts.append(self.separator)
+        parts.append(val)
         return ' '.join(parts)
 
     def prefix_string(self, share_str):
-        m = self.re.match(share_str)
-        if m is None:
-            raise ValueError("unable to parse share string")
-        return m.group(1)
+        return self._split(share_str)[0]
 
     def value_string(self, share_str):
-        m = self.re.match(share_str)
-        if m is None:
-            raise ValueError("unable to parse share string")
-        return m.group(2)
+        return self._split(share_str)[1]
 
     @staticmethod
     def common_prefix(shares):
-        if len(shares) >= 1:
-            prefix = shares[0].prefix
-            for sh in shares[1:]:
-                prefix = ShareFactory._common_prefix(prefix, sh.prefix)
-            return prefix
-        else:
+        if len(shares) == 0:
             raise ValueError("list of shares is empty")
-
-    @staticmethod
-    def _common_prefix_length(p1, p2):
-        idx_max = min(len(p1), len(p2))
-        for idx in range(idx_max):
-            if p1[idx] != p2[idx]:
-                return idx
-        else:
-            return idx_max
-
-    @staticmethod
-    def _common_prefix(p1, p2):
-        length = ShareFactory._common_prefix_length(p1, p2)
-        return p1[:length]
+        elif len(shares) == 1:
+            return shares[0].prefix
+        # scan the prefixes column by column, stopping at the first column
+        # on which they differ
+        columns = zip(*(sh.prefix for sh in shares))
+        return tuple(col[0] for col in
+                     takewhile(lambda col: len(set(col)) == 1, columns))
 
 
-@dataclass
+@dataclass(init=False)
 class Share:
     """
     Class representing a secret or a share of a Shamir secret pool.  This is a
     dumb data class, and all values and prefixes are represented as int values.
     """
+    # slotted, as pools may hold many shares; the constructor is written out
+    # since a slotted field cannot also carry a class-level default
+    __slots__ = ('value', 'prefix')
+
     value: int
-    prefix: Tuple[int, ...] = ()
+    prefix: Tuple[int, ...]
+
+    def __init__(self, value, prefix=()):
+        self.value = value
+        self.prefix = prefix
 
     def depth(self):
         return len(self.prefix)
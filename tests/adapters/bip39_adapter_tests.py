@@ -0,0 +1,102 @@
+import unittest
+from shamir.adapters import BIP39Adapter
+from mnemonic import Mnemonic
+import random
+import unicodedata
+
+
+class TestBIP39Adapter(unittest.TestCase):
+    def test_to_int(self):
+        """
+        Test that mnemonic decoding agrees with the reference implementation
+        for all supported bitlengths.
+        """
+        bip39 = Mnemonic("english")
+        rng = random.Random(0)
+        for bitlength in [128, 160, 192, 224, 256]:
+            adapter = BIP39Adapter(bitlength)
+            for _ in range(10):
+                entropy = rng.getrandbits(bitlength).to_bytes(
+                    bitlength // 8, byteorder='big')
+                mnemo = bip39.to_mnemonic(entropy)
+                msg = "mnemonic = %s" % mnemo
+                self.assertEqual(
+                    adapter.to_int(mnemo),
+                    int.from_bytes(entropy, byteorder='big'),
+                    msg)
+
+    def test_to_int_abbreviated(self):
+        """
+        Test that mnemonics with abbreviated words are expanded.
+        """
+        adapter = BIP39Adapter(128)
+        full = ' '.join(['abandon'] * 11 + ['about'])
+        abbreviated = ' '.join(['aband'] * 11 + ['abou'])
+        self.assertEqual(adapter.to_int(abbreviated), adapter.to_int(full))
+
+    def test_to_int_normalization(self):
+        """
+        Test that mnemonics are decoded regardless of Unicode normalization.
+        """
+        for lang in ["spanish", "french", "russian"]:
+            adapter = BIP39Adapter(128, lang)
+            mnemo = adapter.from_int(123456789)
+            for form in ["NFC", "NFKD"]:
+                msg = "language = %s, form = %s" % (lang, form)
+                self.assertEqual(
+                    adapter.to_int(unicodedata.normalize(form, mnemo)),
+                    123456789, msg)
+
+    def test_to_int_invalid(self):
+        """
+        Test that invalid mnemonics are rejected.
+        """
+        adapter = BIP39Adapter(128)
+        bad_inputs = [
+            # bad checksum
+            'abandon abandon abandon abandon abandon abandon'
+            ' abandon abandon abandon abandon abandon abandon',
+            # unknown word
+            'abandon abandon abandon abandon abandon abandon'
+            ' abandon abandon abandon abandon abandon xyzzy',
+            # incorrect bitlength
+            'abandon abandon abandon abandon abandon abandon'
+            ' abandon abandon abandon abandon abandon abandon'
+            ' abandon abandon abandon abandon abandon abandon'
+            ' abandon abandon abandon abandon abandon art',
+            # invalid number of words
+            'abandon abandon about',
+        ]
+        for str_value in bad_inputs:
+            msg = "str_value = %s" % str_value
+            with self.assertRaises(ValueError, msg=msg):
+                adapter.to_int(str_value)
+
+    def test_from_int(self):
+        """
+        Test that integers round trip through mnemonic encoding.
+        """
+        rng = random.Random(1)
+        for bitlength in [128, 160, 192, 224, 256]:
+            adapter = BIP39Adapter(bitlength)
+            for _ in range(10):
+                value = rng.randrange(adapter.p)
+                mnemo = adapter.from_int(value)
+                self.assertEqual(adapter.to_int(mnemo), value)
+
+    def test_format_mnemonic(self):
+        """
+        Test pretty formatting of mnemonics given as strings or word lists.
+        """
+        mnemo = ' '.join(['w%d' % i for i in range(1, 13)])
+        expected = '\n'.join([
+            '1. w1         7. w7        ',
+            '2. w2         8. w8        ',
+            '3. w3         9. w9        ',
+            '4. w4        10. w10       ',
+            '5. w5        11. w11       ',
+            '6. w6        12. w12       ',
+        ])
+        self.assertEqual(BIP39Adapter.format_mnemonic(mnemo), expected)
+        self.assertEqual(
+            BIP39Adapter.format_mnemonic(str.split(mnemo)), expected)
@@ -0,0 +1,29 @@
+import unittest
+from shamir.adapters.int_adapter import IntAdapter
+
+
+class TestIntAdapter(unittest.TestCase):
+    def test_conversion(self):
+        """
+        Test conversion of integers in string format, and range checking of
+        values against the adapter modulus.
+        """
+        adapter = IntAdapter(8)
+        for value in [0, 1, 100, adapter.p - 1]:
+            self.assertEqual(adapter.to_int(str(value)), value)
+            self.assertEqual(adapter.from_int(value), str(value))
+
+        for value in [-1, adapter.p, 256]:
+            msg = "value = %d" % value
+            with self.assertRaises(ValueError, msg=msg):
+                adapter.to_int(str(value))
+            with self.assertRaises(ValueError, msg=msg):
+                adapter.from_int(value)
+
+        with self.assertRaises(ValueError):
+            adapter.from_int('5')
+
+    def test_get_bitlength(self):
+        self.assertEqual(IntAdapter.get_bitlength(0), 0)
+        self.assertEqual(IntAdapter.get_bitlength(255), 8)
+        self.assertEqual(IntAdapter.get_bitlength('256'), 9)
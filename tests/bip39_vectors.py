@@ -1,5 +1,6 @@
 from mnemonic import Mnemonic
 from shamir import Shamir, get_prime
+from shamir.mod_util import lagrange_interpolate
 import random
 
 
@@ -14,7 +15,7 @@ def random_vector(seed=None, random_lang=False):
     prime = get_prime(8 * size)
     shamir = Shamir(prime)
 
-    secret = random.getrandbits(8 * size)
+    secret = random.randrange(prime)
     if random_lang:
         lang = random.choice(_seed_phrase_langs)
     else:
@@ -26,23 +27,25 @@ def random_vector(seed=None, random_lang=False):
     num_shares = threshold + random.randint(1, 3)
     coeffs = [random.randint(0, prime - 1) for i in range(threshold - 1)]
 
-    shares = shamir.generate_pool(
-        secret, threshold, num_shares, coeffs=coeffs)
-    extra_share = shamir.extend_pool(
-        random.randint(10, 1000), shares)
+    shares = shamir.gen(secret, coeffs, range(1, num_shares + 1))
+    x_s, y_s = zip(*shares)
+    extra_x = random.randint(10, 1000)
+    extra_y = lagrange_interpolate(extra_x, x_s, y_s, prime)
+
     share_mnemonics = list()
-    for _, y in shares:
+    for y in y_s:
         mnemo = bip39.to_mnemonic(
             y.to_bytes(size, byteorder='big'))
         share_mnemonics.append(mnemo)
-    # extra_share_mnemonic = bip39.to_mnemonic(
-    #     extra_share[1], byteorder='big')
+    extra_share_mnemonic = bip39.to_mnemonic(
+        extra_y.to_bytes(size, byteorder='big'))
 
     vector = dict()
     vector['secret'] = mnemonic
     vector['coefficients'] = coeffs
-    vector['shares'] = {sh[0]: m for sh, m in zip(shares, share_mnemonics)}
-    # vector['extra_shares'] = {extra_share[0]: extra
+    vector['shares'] = dict(zip(x_s, share_mnemonics))
+    vector['extra_shares'] = {extra_x: extra_share_mnemonic}
+    return vector
 
 
 vectors = [
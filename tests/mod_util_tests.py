@@ -68,3 +68,78 @@ class TestModUtil(unittest.TestCase):
             x, y = 0, 2
             with self.assertRaises(ValueError):
                 mod_util.lagrange_interpolate(x, bad_x_s, bad_y_s, p)
+
+    def test_batch_inverse(self):
+        """
+        Test that batch modular inversion agrees with individual inversion.
+        """
+        p = 11
+        values = [1, 2, 3, 4, 6, 10, 23]
+        self.assertEqual(
+            mod_util.batch_inverse_mod(values, p),
+            [pow(v, -1, p) for v in values])
+        self.assertEqual(mod_util.batch_inverse_mod([], p), [])
+
+        with self.assertRaises(ValueError):
+            mod_util.batch_inverse_mod([1, 2, 11], p)
+
+    def test_poly_evaluation_batch(self):
+        """
+        Test that evaluation at many points agrees with pointwise evaluation.
+        """
+        for N in [11, 2**127 - 1]:
+            coeffs = [2, 5, 3, N - 1, 7]
+            xs = [0, 1, 5, 11, -10, 1000, N + 3]
+            self.assertEqual(
+                mod_util.eval_poly_mod_batch(coeffs, xs, N),
+                [mod_util.eval_poly_mod(coeffs, x, N) for x in xs])
+        self.assertEqual(mod_util.eval_poly_mod_batch([2, 5], [], 11), [])
+
+    def test_fast_mod_pseudo_mersenne(self):
+        """
+        Test reduction modulo primes of the form 2^n - c.
+        """
+        for n, c in [(4, 5), (7, 1), (521, 1), (1024, 105)]:
+            p = 2**n - c
+            for a in [0, 1, p - 1, p, p + 1, 2**n, (p - 1)**2, 3 * p**3 + 7,
+                      -1, -p - 5]:
+                msg = "(a, n, c) = %s" % ((a, n, c), )
+                self.assertEqual(
+                    mod_util.fast_mod_pseudo_mersenne(a, n, c), a % p, msg)
+
+    def test_lagrange_at_zero(self):
+        """
+        Test interpolation at zero using precomputed barycentric weights.
+        """
+        # f(x) = 2 + 5x + 3x^2 (mod 11)
+        p = 11
+        x_s = range(10)
+        y_s = [2, 10, 2, 0, 4, 3, 8, 8, 3, 4]
+
+        for idx_s in [(1, 4, 6), (4, 5, 6), (7, 1, 2), (9, 8, 0)]:
+            cur_x_s = tuple(x_s[i] for i in idx_s)
+            cur_y_s = tuple(y_s[i] for i in idx_s)
+            weights = mod_util.barycentric_weights(cur_x_s, p)
+            self.assertEqual(
+                mod_util.lagrange_at_zero(cur_x_s, cur_y_s, weights, p), 2)
+
+        with self.assertRaises(ValueError):
+            mod_util.barycentric_weights((1, 1, 3), p)
+
+    def test_unrolled_poly_evaluation(self):
+        """
+        Test that generated polynomial evaluation functions agree with
+        ``eval_poly_mod``.
+        """
+        for N in [11, 2**127 - 1, 2**521 - 1]:
+            for k in [1, 2, 3, 8]:
+                coeffs = [(7 * i + 3) % N for i in range(k)]
+                poly = mod_util.unrolled_poly_mod(k, N)
+                for x in [0, 1, 5, 10, 1000]:
+                    msg = "(N, k, x) = %s" % ((N, k, x), )
+                    self.assertEqual(
+                        poly(x, *coeffs),
+                        mod_util.eval_poly_mod(coeffs, x, N), msg)
+
+        with self.assertRaises(ValueError):
+            mod_util.unrolled_poly_mod(0, 11)
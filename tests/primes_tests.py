@@ -5,7 +5,7 @@ import math
 
 
 valid_bitlengths = primes.valid_bitlengths()
-invalid_bitlengths = [0, max(valid_bitlengths) + 1, -5, 1.5, 'a']
+invalid_bitlengths = [0, max(valid_bitlengths) + 1, -5, 1.5, 'a', True, []]
 
 class TestPrimes(unittest.TestCase):
 
@@ -42,3 +42,8 @@ class TestPrimes(unittest.TestCase):
         for bits in valid_bitlengths:
             s = primes.format_prime(bits)
             self.assertEqual(type(s), str)
+
+        for bits in invalid_bitlengths:
+            msg = "bits = %s" % bits
+            with self.assertRaises(ValueError, msg=msg):
+                primes.format_prime(bits)
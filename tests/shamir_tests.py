@@ -1,6 +1,6 @@
 import unittest
 
-from shamir.shamir import Shamir, ShamirSpec
+from shamir.shamir import Shamir, ShamirSpec, _sample_coeffs
 from shamir.share import Share
 import itertools
 import random
@@ -92,6 +92,12 @@ class TestShamir(unittest.TestCase):
         for sh1, sh2 in zip(shares1, shares2):
             self.assertEqual(sh1, sh2)
 
+        # skipping validation does not change the generated shares
+        shares3 = shamir.generate(secret, spec, seed=seed, validate=False)
+        self.assertEqual(shares3, shares1)
+        with self.assertRaises(ValueError):
+            shamir.generate(secret, ShamirSpec(k, k - 1), validate=True)
+
     def test_shamir_extend(self):
         s, k, n, p = 0, 2, 4, 11
         shamir = Shamir(p)
@@ -123,8 +129,103 @@ class TestShamir(unittest.TestCase):
                 raise(e)
                 self.fail(msg)
 
+    def test_shamir_build_extensible(self):
+        """
+        Test that shares from a prepared pool agree with those produced by
+        extending the pool one share at a time.
+        """
+        p = 101
+        shamir = Shamir(p)
+        secret = Share(42)
+        spec = ShamirSpec(3, (2, (1, ShamirSpec(2, 3))))
+        shares = shamir.generate(secret, spec)
+
+        pool = shamir.build_extensible(shares)
+        for x in range(1, p):
+            self.assertEqual(pool.extend(x), shamir.extend(x, shares))
+        sub_pool = shamir.build_extensible(shares, (3, ))
+        for x in range(1, 5):
+            self.assertEqual(
+                sub_pool.extend(x), shamir.extend((3, x), shares))
+
+        for x in [1.5, 0, p]:
+            with self.assertRaises(ValueError, msg="x = %s" % x):
+                pool.extend(x)
+        for prefix in [3, (3.0, ), (p, )]:
+            with self.assertRaises(ValueError, msg="prefix = %s" % (prefix, )):
+                shamir.build_extensible(shares, prefix)
+        with self.assertRaises(ValueError):
+            shamir.build_extensible(shares, (4, ))
+        with self.assertRaises(ValueError):
+            shamir.build_extensible([])
+
     def test_shamir_combine(self):
-        pass
+        """
+        Test recovery of a secret from a nested pool, where one share of the
+        top level pool has been split into a pool of its own.
+        """
+        p = 101
+        shamir = Shamir(p)
+        secret = Share(42)
+        shares = shamir.generate(secret, ShamirSpec(2, 3))
+        sub_shares = shamir.generate(shares[0], ShamirSpec(2, 3))
+        for sh in sub_shares:
+            self.assertEqual(sh.prefix[:-1], shares[0].prefix)
+
+        self.assertEqual(shamir.combine(sub_shares[1:]), shares[0])
+        for top_share in shares[1:]:
+            for pair in itertools.combinations(sub_shares, 2):
+                selected = pair + (top_share, )
+                self.assertEqual(shamir.combine(selected), secret)
+
+        # extend the nested pool at both levels
+        new_sub_share = shamir.extend(shares[0].prefix + (4, ), sub_shares)
+        self.assertEqual(
+            shamir.combine([new_sub_share, sub_shares[0]]), shares[0])
+        new_share = shamir.extend(4, sub_shares[:2] + [shares[2]])
+        self.assertEqual(shamir.combine([new_share, shares[1]]), secret)
+
+        # generate a nested pool directly from a specification
+        spec = ShamirSpec(2, (1, (2, ShamirSpec(2, 3))))
+        nested_shares = shamir.generate(secret, spec)
+        self.assertEqual(len(nested_shares), spec.total_shares)
+        self.assertEqual(
+            sorted(sh.prefix for sh in nested_shares),
+            [(1, ), (2, 1), (2, 2), (2, 3), (3, 1), (3, 2), (3, 3)])
+        self.assertEqual(shamir.combine(nested_shares[0:3]), secret)
+        self.assertEqual(shamir.combine(nested_shares[2:6]), secret)
+
+    def test_shamir_spec(self):
+        """
+        Test share and coefficient counts of nested pool specifications.
+        """
+        spec = ShamirSpec(2, 3)
+        self.assertEqual(spec.num_shares, 3)
+        self.assertEqual(spec.total_shares, 3)
+        self.assertEqual(spec.num_coeffs, 1)
+
+        sub_spec = ShamirSpec(3, 4)
+        spec = ShamirSpec(3, (2, (2, sub_spec)))
+        spec.validate()
+        self.assertEqual(spec.num_shares, 4)
+        self.assertEqual(spec.total_shares, 10)
+        self.assertEqual(spec.num_coeffs, 6)
+
+        with self.assertRaises(ValueError):
+            ShamirSpec(5, (2, (2, sub_spec))).validate()
+
+    def test_sample_coeffs(self):
+        """
+        Test that sampled coefficients are in range for both system and
+        deterministic random number generators.
+        """
+        for rng in [random.SystemRandom(), random.Random(0)]:
+            for p in [2, 3, 11, 2**127 - 1]:
+                msg = "p = %d, rng = %s" % (p, type(rng).__name__)
+                coeffs = _sample_coeffs(50, p, rng)
+                self.assertEqual(len(coeffs), 50, msg)
+                self.assertTrue(all(0 <= c < p for c in coeffs), msg)
+            self.assertEqual(_sample_coeffs(0, 11, rng), [])
 
 
 # def gen_simple_pool(s, k, n, p):
@@ -4,21 +4,95 @@ from shamir.share import ShareFactory, Share
 from shamir.adapters.int_adapter import IntAdapter
 
 
+# share strings parsed with the default separator, using an 8-bit integer
+# adapter, and the resulting shares
+PARSER_CASES = (
+    # empty prefix
+    ('0', Share(0, ())),
+    ('  0', Share(0, ())),
+    ('0  ', Share(0, ())),
+    # nonempty prefix
+    ('1 0', Share(0, (1, ))),
+    ('\t1   0 \t', Share(0, (1, ))),
+    (' 1\t0\n', Share(0, (1, ))),
+    # longer prefix
+    ('5 4 3 2 1 0', Share(0, (5, 4, 3, 2, 1))),
+    # large integers allowed in prefix
+    ('99999 10', Share(10, (99999, ))),
+    # long runs of trailing whitespace
+    ('1 0' + ' ' * 20000, Share(0, (1, ))),
+)
+
+PARSER_ERROR_CASES = (
+    # string of only whitespace
+    '',
+    '  ',
+    '\n',
+    # invalid prefix
+    'a 0',
+    ':::120398dfajls 0',
+    # value after prefix rejected by adapter
+    '1 256',
+)
+
+# the same, with a specified separator string
+CUSTOM_SEPARATOR = 'foo'
+
+CUSTOM_SEPARATOR_CASES = (
+    # empty prefix
+    ('0', Share(0, ())),
+    ('  0', Share(0, ())),
+    ('0  ', Share(0, ())),
+    # nonempty prefix
+    ('1 foo 0', Share(0, (1, ))),
+    ('1 foo0', Share(0, (1, ))),
+    ('1foo 0', Share(0, (1, ))),
+    ('1foo0', Share(0, (1, ))),
+    ('1\tfoo\t0', Share(0, (1, ))),
+    ('1 foo 0', Share(0, (1, ))),
+)
+
+CUSTOM_SEPARATOR_ERROR_CASES = (
+    # string of only whitespace
+    '',
+    '  ',
+    '\n',
+    # invalid prefix
+    'a foo 0',
+    ':::120398dfajls foo 0',
+    # missing separator
+    '1 0',
+    '5 4 3 2 1 0',
+    '1 bar 0',
+    '1fo0',
+)
+
+
 class TestShare(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.adapter = IntAdapter(8)
+        cls.default_factory = ShareFactory()
+        cls.custom_factory = ShareFactory(separator=CUSTOM_SEPARATOR)
+        # shares with varied prefixes, for common prefix computations
+        cls.prefix_shares = tuple(
+            Share(value, prefix) for value, prefix in enumerate([
+                (),
+                (1,),
+                (1, 2),
+                (1, 3),
+                (2, 1),
+                (1, 2, 3),
+                (1, 2, 4),
+                (1, 2, 3, 4),
+            ])
+        )
+
     def test_common_prefix(self):
         """
         Test construction of longest common prefix of shares.
         """
-        shares = [
-            Share(0, ()),
-            Share(1, (1,)),
-            Share(2, (1, 2)),
-            Share(3, (1, 3)),
-            Share(4, (2, 1)),
-            Share(5, (1, 2, 3)),
-            Share(6, (1, 2, 4)),
-            Share(7, (1, 2, 3, 4)),
-        ]
+        shares = self.prefix_shares
         cases = [
             ([0], ()),
             ([0, 1], ()),
@@ -29,93 +103,117 @@ class TestShare(unittest.TestCase):
             ([6, 7], (1, 2)),
             ([3, 5], (1,)),
         ]
-        for share_indices, prefix in cases:
-            share_list = [shares[i] for i in share_indices]
-            self.assertEqual(ShareFactory.common_prefix(share_list), prefix)
+        actual = [
+            ShareFactory.common_prefix([shares[i] for i in share_indices])
+            for share_indices, _ in cases
+        ]
+        self.assertEqual(actual, [prefix for _, prefix in cases])
+
+        with self.assertRaises(ValueError):
+            ShareFactory.common_prefix([])
 
     def test_parser(self):
         """
         Test the parser regular expression for share strings.
         """
+        adapter, sh_fact = self.adapter, self.default_factory
+        # factories with the same separator share a compiled pattern
+        self.assertIs(ShareFactory().re, sh_fact.re)
+        for share_str, share in PARSER_CASES:
+            with self.subTest(share_str=share_str):
+                self.assertEqual(sh_fact.parse(share_str, adapter), share)
 
-        # Test parsing with BIP39 adapter and default separator string
-        bitlength = 8
-        adapter = IntAdapter(bitlength)
-        sh_fact = ShareFactory()
-
-        cases = [
-            # empty prefix
-            ('0', Share(0, ())),
-            ('  0', Share(0, ())),
-            ('0  ', Share(0, ())),
-            # nonempty prefix
-            ('1 0', Share(0, (1, ))),
-            ('\t1   0 \t', Share(0, (1, ))),
-            (' 1\t0\n', Share(0, (1, ))),
-            # longer prefix
-            ('5 4 3 2 1 0', Share(0, (5, 4, 3, 2, 1))),
-            # large integers allowed in prefix
-            ('99999 10', Share(10, (99999, ))),
-        ]
-        for share_str, share in cases:
-            msg = 'share_str = "%s"' % share_str
-            self.assertEqual(sh_fact.parse(share_str, adapter), share, msg)
-
-        error_cases = [
-            # string of only whitespace
-            '',
-            '  ',
-            '\n',
-            # invalid prefix
-            'a 0',
-            ':::120398dfajls 0',
-            # value after prefix rejected by adapter
-            '1 256'
-        ]
-        for share_str in error_cases:
-            msg = 'share_str = "%s"' % share_str
-            with self.assertRaises(ValueError, msg=msg):
-                sh_fact.parse(share_str, adapter)
+        for share_str in PARSER_ERROR_CASES:
+            with self.subTest(share_str=share_str):
+                with self.assertRaises(ValueError):
+                    sh_fact.parse(share_str, adapter)
 
     def test_parser_custom_separator(self):
-        # Test parsing with integer adapter and specified separator string
-        bitlength = 8
-        adapter = IntAdapter(bitlength)
-        sep = 'foo'
-        sh_fact = ShareFactory(separator=sep)
+        """
+        Test the parser regular expression with a specified separator string.
+        """
+        adapter, sh_fact = self.adapter, self.custom_factory
+        sep = CUSTOM_SEPARATOR
+        for share_str, share in CUSTOM_SEPARATOR_CASES:
+            with self.subTest(share_str=share_str, separator=sep):
+                self.assertEqual(sh_fact.parse(share_str, adapter), share)
 
-        cases = [
-            # empty prefix
-            ('0', Share(0, ())),
-            ('  0', Share(0, ())),
-            ('0  ', Share(0, ())),
-            # nonempty prefix
-            ('1 foo 0', Share(0, (1, ))),
-            ('1 foo0', Share(0, (1, ))),
-            ('1foo 0', Share(0, (1, ))),
-            ('1foo0', Share(0, (1, ))),
-            ('1\tfoo\t0', Share(0, (1, ))),
-            ('1 foo 0', Share(0, (1, ))),
-        ]
-        for share_str, share in cases:
-            msg = 'share_str = "%s", separator = "%s"' % (share_str, sep)
-            self.assertEqual(sh_fact.parse(share_str, adapter), share, msg)
-
-        error_cases = [
-            # string of only whitespace
-            '',
-            '  ',
-            '\n',
-            # invalid prefix
-            'a foo 0',
-            ':::120398dfajls foo 0',
-            # missing separator
-            '1 0',
-            '5 4 3 2 1 0',
-            '1 bar 0',
-            '1fo0',
+        for share_str in CUSTOM_SEPARATOR_ERROR_CASES:
+            with self.subTest(share_str=share_str, separator=sep):
+                with self.assertRaises(ValueError):
+                    sh_fact.parse(share_str, adapter)
+
+    def test_try_parse(self):
+        """
+        Test that try_parse agrees with parse, returning None on errors.
+        """
+        adapter, sh_fact = self.adapter, self.default_factory
+        for share_str, share in PARSER_CASES:
+            with self.subTest(share_str=share_str):
+                self.assertEqual(sh_fact.try_parse(share_str, adapter), share)
+
+        for share_str in PARSER_ERROR_CASES + ('1,2 0', ):
+            with self.subTest(share_str=share_str):
+                self.assertIsNone(sh_fact.try_parse(share_str, adapter))
+
+    def test_split_strings(self):
+        """
+        Test extraction of the prefix and value strings of a share string.
+        """
+        sh_fact = self.default_factory
+        self.assertEqual(sh_fact.prefix_string('3 2 abc def'), '3 2')
+        self.assertEqual(sh_fact.value_string('3 2 abc def'), 'abc def')
+        self.assertIsNone(sh_fact.prefix_string('abc def '))
+        self.assertEqual(sh_fact.value_string('abc def '), 'abc def')
+
+        # content on a further line is rejected
+        for share_str in ['1 abc\ndef', 'abc\n\ndef']:
+            with self.subTest(share_str=share_str):
+                with self.assertRaises(ValueError):
+                    sh_fact.value_string(share_str)
+
+    def test_malformed_rejected(self):
+        """
+        Test that malformed share strings with a long digit and whitespace
+        prefix are rejected.  These are large enough that matching which
+        backtracks over every split of the prefix does not finish.
+        """
+        adapter = self.adapter
+        malformed = [
+            '1 ' * 5000 + 'a\nb',
+            ' ' * 100000 + 'a\nb',
+            '1\n' * 100000 + 'a\nb',
         ]
-        for share_str in error_cases:
-            msg = 'share_str = "%s", separator = "%s"' % (share_str, sep)
-            with self.assertRaises(ValueError, msg=msg):
-                sh_fact.parse(share_str, adapter)
+        for sh_fact in [self.default_factory, self.custom_factory]:
+            for share_str in malformed:
+                with self.subTest(share_str=share_str[-8:],
+                                  separator=sh_fact.separator_re):
+                    with self.assertRaises(ValueError):
+                        sh_fact.parse(share_str, adapter)
+                    self.assertIsNone(sh_fact.try_parse(share_str, adapter))
+
+    def test_parse_batch(self):
+        """
+        Test that batch parsing agrees with parsing shares individually.
+        """
+        adapter, sh_fact = self.adapter, self.default_factory
+        share_strs = ['0', '1 0', '\t1   2 \t', '5 4 3 2 1 0', '99999 10']
+        self.assertEqual(
+            sh_fact.parse_batch(share_strs, adapter),
+            tuple(sh_fact.parse(s, adapter) for s in share_strs))
+
+        for share_strs in [['1 0', '  '], ['a 0'], ['1 0', '1 256']]:
+            with self.subTest(share_strs=share_strs):
+                with self.assertRaises(ValueError):
+                    sh_fact.parse_batch(share_strs, adapter)
+
+    def test_format_batch(self):
+        """
+        Test that batch formatting agrees with formatting shares individually.
+        """
+        adapter = self.adapter
+        shares = [Share(0, ()), Share(7, (1, )), Share(200, (3, 2, 1))]
+        for sh_fact in [self.default_factory, self.custom_factory]:
+            self.assertEqual(
+                sh_fact.format_batch(shares, adapter),
+                [sh_fact.format(sh, adapter) for sh in shares])